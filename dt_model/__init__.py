@@ -3,5 +3,6 @@ from dt_model.model.model import Model
 from dt_model.symbols.constraint import Constraint
 from dt_model.symbols.context_variable import (ContextVariable, UniformCategoricalContextVariable,
                                                CategoricalContextVariable, ContinuousContextVariable)
-from dt_model.symbols.index import Index
+from dt_model.symbols.index import (Index, UniformDistIndex, LognormDistIndex, TriangDistIndex, group_indexes,
+                                   materialize_group)
 from dt_model.symbols.presence_variable import PresenceVariable
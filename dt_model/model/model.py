@@ -6,9 +6,9 @@ from functools import reduce
 
 import numpy as np
 import pandas as pd
-from sympy import lambdify
 from scipy import interpolate
 
+from dt_model.symbols._lambdify import cached_lambdify
 from dt_model.symbols.constraint import Constraint
 from dt_model.symbols.context_variable import ContextVariable
 from dt_model.symbols.index import Index
@@ -63,13 +63,13 @@ class Model:
         p_values = [np.expand_dims(grid[pv], axis=(i, 2)) for i,pv in enumerate(self.pvs)]
         c_values = [np.expand_dims(c_subs[index], axis=(0, 1)) for index in self.indexes]
         for constraint in self.constraints:
-            usage = lambdify(self.pvs + self.indexes, constraint.usage, "numpy")(*p_values, *c_values)
+            usage = cached_lambdify(self.pvs + self.indexes, constraint.usage, "numpy")(*p_values, *c_values)
             capacity = constraint.capacity
             # TODO: model type in declaration
             if isinstance(capacity.value, numbers.Number):
                 unscaled_result = usage <= capacity.value
             else:
-                unscaled_result = 1.0 - capacity.value.cdf(usage)
+                unscaled_result = capacity.value.sf(usage)
             result = np.broadcast_to(np.dot(unscaled_result, c_weight), grid_shape)
             self.field_elements[constraint] = result
             self.field *= result
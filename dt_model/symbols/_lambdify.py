@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import functools
+from typing import Any, Callable
+
+from sympy import Basic, Dummy, lambdify, preorder_traversal, srepr, sympify
+
+
+class _LambdifyKey:
+    """
+    Hashable key for the lambdify cache.
+
+    Two keys are equal if the arguments and the expression have the same structure, once the Dummy symbols
+    (whose indices change at every creation) are renamed in order of appearance.
+    """
+
+    def __init__(self, args: list, expr: Any, modules: str, cse: bool) -> None:
+        self.args = args
+        self.expr = expr
+        self.modules = modules
+        self.cse = cse
+        self._key = (*_canonical_srepr(args, expr), modules, cse)
+        self._hash = hash(self._key)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _LambdifyKey) and self._key == other._key
+
+
+def _canonical_srepr(args: list, expr: Any) -> tuple[str, str]:
+    expr = sympify(expr)
+    dummies = {}
+    for tree in (*args, expr):
+        for node in preorder_traversal(tree):
+            if isinstance(node, Dummy) and node not in dummies:
+                dummies[node] = Dummy(node.name, dummy_index=len(dummies), **node.assumptions0)
+    if dummies:
+        args = [a.xreplace(dummies) if isinstance(a, Basic) else a for a in args]
+        expr = expr.xreplace(dummies)
+    return srepr(args), srepr(expr)
+
+
+@functools.lru_cache(maxsize=512)
+def _get_lambdified(key: _LambdifyKey) -> Callable:
+    return lambdify(key.args, key.expr, key.modules, cse=key.cse)
+
+
+def cached_lambdify(args: list, expr: Any, modules: str = "numpy", cse: bool = True) -> Callable:
+    """
+    Returns the function generated by sympy lambdify, reusing a previously generated one if an identical
+    expression (up to Dummy symbols) has already been compiled.
+
+    Parameters
+    ----------
+    args: list
+        Symbols used as arguments of the function.
+    expr: Any
+        Expression to compile.
+    modules: str (default "numpy")
+        Module used by lambdify for numeric functions.
+    cse: bool (default True)
+        If True, common sub-expressions are extracted and evaluated only once by the generated function.
+
+    Returns
+    -------
+    Callable
+        The compiled function.
+    """
+    return _get_lambdified(_LambdifyKey(list(args), expr, modules, cse))
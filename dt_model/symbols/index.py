@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import functools
+from collections.abc import Iterator, MutableMapping
 from typing import Any
 
-from sympy import lambdify
+import numpy as np
+import numpy.typing as npt
+from scipy import stats
 
 from dt_model.symbols._base import SymbolExtender
+from dt_model.symbols._lambdify import cached_lambdify
 from dt_model.symbols.context_variable import ContextVariable
 
 
@@ -17,6 +22,528 @@ class Index(SymbolExtender):
         super().__init__(name)
         self.cvs = cvs
         if cvs is not None:
-            self.value = lambdify(cvs, value, "numpy")
+            self.value = cached_lambdify(cvs, value, "numpy")
         else:
             self.value = value
+
+
+_CACHED_INPUT_SIZE = 64
+"""Inputs up to this number of elements are evaluated through _cached_evaluate."""
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_evaluate(dist: stats.rv_continuous, method: str, params: tuple, dtype: str, shape: tuple, data: bytes):
+    result = getattr(dist, method)(np.frombuffer(data, dtype=dtype).reshape(shape), **dict(params))
+    if isinstance(result, np.ndarray):
+        result.flags.writeable = False
+    return result
+
+
+class _FrozenLike:
+    """
+    Stand-in for a frozen scipy.stats distribution.
+
+    It keeps the (non-frozen) distribution class and its parameters, and dispatches the methods directly to the
+    class, thus avoiding the cost of freezing the distribution whenever a parameter changes.
+    The parameters belong to the index using the stand-in: change them through its setters, not by writing
+    the kwargs dict.
+    """
+
+    def __init__(self, dist: stats.rv_continuous, **kwargs) -> None:
+        self.dist = dist
+        self.kwargs = kwargs
+
+    def _evaluate(self, method: str, x):
+        """
+        Evaluates a method of the distribution on x.
+
+        Small numeric inputs are looked up in a cache keyed by distribution, method, parameters and input values,
+        so that repeated evaluations with unchanged parameters do not go through scipy.stats again.
+        """
+        x_array = np.asarray(x)
+        if x_array.size <= _CACHED_INPUT_SIZE and x_array.dtype.kind in "iuf":
+            params = tuple(sorted(self.kwargs.items()))
+            try:
+                result = _cached_evaluate(self.dist, method, params, x_array.dtype.str, x_array.shape,
+                                          x_array.tobytes())
+            except TypeError:  # Unhashable parameters
+                pass
+            else:
+                return result.copy() if isinstance(result, np.ndarray) else result
+        return getattr(self.dist, method)(x, **self.kwargs)
+
+    def rvs(self, size=None, random_state=None):
+        return self.dist.rvs(size=size, random_state=random_state, **self.kwargs)
+
+    def pdf(self, x):
+        return self._evaluate("pdf", x)
+
+    def logpdf(self, x):
+        return self._evaluate("logpdf", x)
+
+    def cdf(self, x):
+        return self._evaluate("cdf", x)
+
+    def logcdf(self, x):
+        return self._evaluate("logcdf", x)
+
+    def sf(self, x):
+        return self._evaluate("sf", x)
+
+    def logsf(self, x):
+        return self._evaluate("logsf", x)
+
+    def ppf(self, q):
+        return self._evaluate("ppf", q)
+
+    def isf(self, q):
+        return self._evaluate("isf", q)
+
+    def mean(self):
+        return self.dist.mean(**self.kwargs)
+
+    def median(self):
+        return self.dist.median(**self.kwargs)
+
+    def std(self):
+        return self.dist.std(**self.kwargs)
+
+    def var(self):
+        return self.dist.var(**self.kwargs)
+
+    def interval(self, confidence):
+        return self.dist.interval(confidence, **self.kwargs)
+
+    def support(self):
+        return self.dist.support(**self.kwargs)
+
+
+class _UniformDist(_FrozenLike):
+    """
+    Uniform distribution with closed-form pdf/cdf/sf, which bypass the scipy.stats infrastructure
+    (argument checks and support masking). Other methods are dispatched to scipy.stats.uniform.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(stats.uniform, **kwargs)
+
+    def pdf(self, x):
+        (loc, scale) = (self.kwargs["loc"], self.kwargs["scale"])
+        if not scale > 0:
+            return super().pdf(x)
+        x = np.asarray(x, dtype=float)
+        result = np.where((x >= loc) & (x <= loc + scale), 1.0 / scale, 0.0)
+        return np.where(np.isnan(x), np.nan, result)[()]
+
+    def cdf(self, x):
+        (loc, scale) = (self.kwargs["loc"], self.kwargs["scale"])
+        if not scale > 0:
+            return super().cdf(x)
+        return np.clip((np.asarray(x, dtype=float) - loc) / scale, 0.0, 1.0)[()]
+
+    def sf(self, x):
+        (loc, scale) = (self.kwargs["loc"], self.kwargs["scale"])
+        if not scale > 0:
+            return super().sf(x)
+        return np.clip((loc + scale - np.asarray(x, dtype=float)) / scale, 0.0, 1.0)[()]
+
+
+class _TriangDist(_FrozenLike):
+    """
+    Triangular distribution with closed-form pdf/cdf/sf, which bypass the scipy.stats infrastructure
+    (argument checks and support masking). Other methods are dispatched to scipy.stats.triang.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(stats.triang, **kwargs)
+
+    def _valid(self) -> bool:
+        return self.kwargs["scale"] > 0 and 0 <= self.kwargs["c"] <= 1
+
+    def _standardize(self, x):
+        return (np.asarray(x, dtype=float) - self.kwargs["loc"]) / self.kwargs["scale"]
+
+    def pdf(self, x):
+        if not self._valid():
+            return super().pdf(x)
+        (y, c) = (self._standardize(x), self.kwargs["c"])
+        if c == 0:
+            result = 2.0 * (1.0 - y)
+        elif c == 1:
+            result = 2.0 * y
+        else:
+            result = np.where(y < c, 2.0 * y / c, 2.0 * (1.0 - y) / (1.0 - c))
+        return np.where((y < 0.0) | (y > 1.0), 0.0, result / self.kwargs["scale"])[()]
+
+    def cdf(self, x):
+        if not self._valid():
+            return super().cdf(x)
+        (y, c) = (self._standardize(x), self.kwargs["c"])
+        if c == 0:
+            result = 1.0 - (1.0 - y) ** 2
+        elif c == 1:
+            result = y * y
+        else:
+            result = np.where(y < c, y * y / c, 1.0 - (1.0 - y) ** 2 / (1.0 - c))
+        return np.where(y <= 0.0, 0.0, np.where(y >= 1.0, 1.0, result))[()]
+
+    def sf(self, x):
+        if not self._valid():
+            return super().sf(x)
+        return (1.0 - self.cdf(x))[()]
+
+
+class _PointMass(_FrozenLike):
+    """
+    Stand-in for a distribution whose parameters are degenerate (e.g., scale = 0), i.e., a point mass.
+
+    All methods return constants, without going through scipy.stats. The distribution and the parameters
+    (shared with the original stand-in) are kept, so that the parameters can still be read. The point is
+    computed once: the parameters change only through update() and the setters of the index, which replace
+    the stand-in as needed.
+    """
+
+    def __init__(self, base: _FrozenLike, point: float) -> None:
+        super().__init__(base.dist)
+        self.kwargs = base.kwargs
+        self.point = point
+
+    def rvs(self, size=None, random_state=None):
+        return self.point if size is None else np.full(size, self.point, dtype=float)
+
+    def pdf(self, x):
+        return np.where(np.asarray(x) == self.point, np.inf, 0.0)[()]
+
+    def logpdf(self, x):
+        return np.where(np.asarray(x) == self.point, np.inf, -np.inf)[()]
+
+    def cdf(self, x):
+        return np.where(np.asarray(x) >= self.point, 1.0, 0.0)[()]
+
+    def logcdf(self, x):
+        return np.where(np.asarray(x) >= self.point, 0.0, -np.inf)[()]
+
+    def sf(self, x):
+        return np.where(np.asarray(x) < self.point, 1.0, 0.0)[()]
+
+    def logsf(self, x):
+        return np.where(np.asarray(x) < self.point, 0.0, -np.inf)[()]
+
+    def ppf(self, q):
+        return np.full_like(np.asarray(q, dtype=float), self.point)[()]
+
+    def isf(self, q):
+        return self.ppf(q)
+
+    def mean(self):
+        return self.point
+
+    def median(self):
+        return self.point
+
+    def std(self):
+        return 0.0
+
+    def var(self):
+        return 0.0
+
+    def interval(self, confidence):
+        return self.point, self.point
+
+    def support(self):
+        return self.point, self.point
+
+
+class _DistArray:
+    """
+    Parameters of the indexes of a group that share the same scipy.stats distribution, stored as one array
+    per parameter (structure of arrays).
+
+    The indexes read and write their parameters through views on these arrays (_DistArraySlot), so that
+    the whole group can be evaluated with a single broadcast call to the distribution.
+    """
+
+    def __init__(self, dist: stats.rv_continuous) -> None:
+        self.dist = dist
+        self.params: dict[str, np.ndarray] = {}
+        self.rows: list[int] = []
+        self.slots: list[_DistArraySlot] = []
+
+    def append(self, params: MutableMapping, row: int) -> _DistArraySlot:
+        """
+        Adds the parameters of an index, which is at the given row of its group, and returns the view on them.
+        """
+        if not self.params:
+            self.params = {p: np.empty(0) for p in params}
+        for p in self.params:
+            self.params[p] = np.append(self.params[p], params[p])
+        self.rows.append(row)
+        self.slots.append(_DistArraySlot(self, len(self.slots)))
+        return self.slots[-1]
+
+    def remove(self, slot: int) -> None:
+        """
+        Removes the parameters in the given slot; the views on the following slots are shifted accordingly.
+        """
+        for p in self.params:
+            self.params[p] = np.delete(self.params[p], slot)
+        del self.rows[slot]
+        del self.slots[slot]
+        for view in self.slots[slot:]:
+            view.slot -= 1
+
+    def evaluate(self, method: str, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluates a method of all the distributions on the 1-D grid x; returns an array (len(rows), x.size).
+        """
+        return getattr(self.dist, method)(x[None, :], **{p: v[:, None] for p, v in self.params.items()})
+
+
+class _DistArraySlot(MutableMapping):
+    """
+    Parameters of a single index, as a view on a slot of a _DistArray.
+    """
+
+    def __init__(self, array: _DistArray, slot: int) -> None:
+        self.array = array
+        self.slot = slot
+
+    def __getitem__(self, param: str) -> float:
+        return self.array.params[param][self.slot].item()
+
+    def __setitem__(self, param: str, value: float) -> None:
+        self.array.params[param][self.slot] = value
+
+    def __delitem__(self, param: str) -> None:
+        raise TypeError("Distribution parameters cannot be removed")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.array.params)
+
+    def __len__(self) -> int:
+        return len(self.array.params)
+
+
+class _DistIndex(Index):
+    """
+    Base class for indexes distributed according to a scipy.stats continuous distribution.
+
+    Indexes with a group are registered, and their parameters are stored in the _DistArray of the group for
+    their distribution, so that all the distributions of the group can be evaluated together
+    (see materialize_group). The registry keeps the indexes alive until they are removed from their group
+    (see remove_from_group).
+    """
+
+    _groups: dict[str, list[_DistIndex]] = {}
+    _arrays: dict[str, dict[stats.rv_continuous, _DistArray]] = {}
+    _materialized: dict[str, dict] = {}
+
+    def __init__(self, name: str, value: _FrozenLike, group: str | None = None) -> None:
+        # Symbols are cached by class and name: creating an index again with the same name re-initializes the
+        # same object, which keeps its slot if it stays in the same group and distribution.
+        reused_slot = None
+        if self.__dict__.get("group") is not None:
+            if self.group == group and self._dist.dist is value.dist:
+                reused_slot = self._dist.kwargs
+            else:
+                self.remove_from_group()
+        super().__init__(name, value)
+        self.group = group
+        if group is not None:
+            if reused_slot is not None:
+                reused_slot.update(value.kwargs)
+                value.kwargs = reused_slot
+            else:
+                members = _DistIndex._groups.setdefault(group, [])
+                array = _DistIndex._arrays.setdefault(group, {}).setdefault(value.dist, _DistArray(value.dist))
+                value.kwargs = array.append(value.kwargs, len(members))
+                members.append(self)
+            _DistIndex._materialized.pop(group, None)
+        self._dist = value
+        self._specialize()
+
+    def remove_from_group(self) -> None:
+        """
+        Removes the index from its group, if any; the index keeps its current parameters.
+        """
+        group = self.group
+        if group is None:
+            return
+        members = _DistIndex._groups[group]
+        row = next(i for (i, m) in enumerate(members) if m is self)
+        del members[row]
+        slot = self._dist.kwargs
+        self._dist.kwargs = dict(slot)
+        slot.array.remove(slot.slot)
+        arrays = _DistIndex._arrays[group]
+        if not slot.array.slots:
+            del arrays[slot.array.dist]
+        for array in arrays.values():
+            array.rows = [r - 1 if r > row else r for r in array.rows]
+        if not members:
+            del _DistIndex._groups[group]
+            del _DistIndex._arrays[group]
+        _DistIndex._materialized.pop(group, None)
+        self.group = None
+        self._specialize()
+
+    def _degenerate_point(self) -> float | None:
+        """
+        Returns the point where the distribution is concentrated if the parameters are degenerate, None otherwise.
+        """
+        return self.loc if self.scale == 0 else None
+
+    def _specialize(self) -> None:
+        point = self._degenerate_point()
+        self.value = self._dist if point is None else _PointMass(self._dist, point)
+
+    def update(self, **params: float) -> None:
+        """
+        Changes one or more parameters of the distribution.
+
+        The parameters are compared all at once, and the group cache is dropped only if some of them
+        actually changes.
+
+        Parameters
+        ----------
+        params: float
+            New values of the parameters (e.g., loc, scale).
+        """
+        kwargs = self._dist.kwargs
+        unknown = params.keys() - kwargs.keys()
+        if unknown:
+            raise TypeError(f"{type(self).__name__} has no parameters {sorted(unknown)}")
+        if tuple(kwargs[p] for p in params) != tuple(params.values()):
+            kwargs.update(params)
+            self._specialize()
+            if self.group is not None:
+                _DistIndex._materialized.pop(self.group, None)
+
+    @property
+    def loc(self) -> float:
+        return self._dist.kwargs["loc"]
+
+    @loc.setter
+    def loc(self, new_loc: float) -> None:
+        self.update(loc=new_loc)
+
+    @property
+    def scale(self) -> float:
+        return self._dist.kwargs["scale"]
+
+    @scale.setter
+    def scale(self, new_scale: float) -> None:
+        self.update(scale=new_scale)
+
+
+class UniformDistIndex(_DistIndex):
+    """
+    Class to represent an index with a uniform distribution in [loc, loc + scale].
+    """
+
+    def __init__(self, name: str, loc: float, scale: float, group: str | None = None) -> None:
+        super().__init__(name, _UniformDist(loc=loc, scale=scale), group=group)
+
+
+class LognormDistIndex(_DistIndex):
+    """
+    Class to represent an index with a lognormal distribution.
+    """
+
+    def __init__(self, name: str, loc: float, scale: float, s: float, group: str | None = None) -> None:
+        super().__init__(name, _FrozenLike(stats.lognorm, loc=loc, scale=scale, s=s), group=group)
+
+    def _degenerate_point(self) -> float | None:
+        if self.scale == 0:
+            return self.loc
+        if self.s == 0:
+            return self.loc + self.scale
+        return None
+
+    @property
+    def s(self) -> float:
+        return self._dist.kwargs["s"]
+
+    @s.setter
+    def s(self, new_s: float) -> None:
+        self.update(s=new_s)
+
+
+class TriangDistIndex(_DistIndex):
+    """
+    Class to represent an index with a triangular distribution in [loc, loc + scale], with mode in loc + c * scale.
+    """
+
+    def __init__(self, name: str, loc: float, scale: float, c: float, group: str | None = None) -> None:
+        super().__init__(name, _TriangDist(loc=loc, scale=scale, c=c), group=group)
+
+    @property
+    def c(self) -> float:
+        return self._dist.kwargs["c"]
+
+    @c.setter
+    def c(self, new_c: float) -> None:
+        self.update(c=new_c)
+
+
+def group_indexes(group: str) -> list[Index]:
+    """
+    Returns the distribution indexes of a group, in the order used for the rows of materialize_group.
+    """
+    return list(_DistIndex._groups.get(group, []))
+
+
+MATERIALIZE_DTYPE: npt.DTypeLike = np.float32
+"""Default dtype of the arrays returned by materialize_group."""
+
+_MATERIALIZE_METHODS = ("pdf", "logpdf", "cdf", "logcdf", "sf", "logsf", "ppf", "isf")
+"""Distribution methods supported by materialize_group (implemented by all the distribution stand-ins)."""
+
+
+def materialize_group(group: str, x: np.ndarray, method: str = "pdf",
+                      dtype: npt.DTypeLike = MATERIALIZE_DTYPE) -> np.ndarray:
+    """
+    Evaluates a method of the distributions of all the indexes of a group on a shared grid.
+
+    Indexes with the same distribution are evaluated with a single broadcast call on their parameter arrays
+    (see _DistArray). The result is cached and recomputed only if the grid changes or if an index of the group
+    is added or has a parameter changed.
+
+    Parameters
+    ----------
+    group: str
+        Name of the group.
+    x: np.ndarray
+        1-D grid where the distributions are evaluated.
+    method: str (default "pdf")
+        Distribution method to evaluate: one of "pdf", "logpdf", "cdf", "logcdf", "sf", "logsf", "ppf", "isf".
+    dtype: npt.DTypeLike (default MATERIALIZE_DTYPE, i.e., np.float32)
+        Dtype of the result. The default float32 halves the memory of the result; pass np.float64 for full
+        precision. Distribution parameters and computations are float64 in both cases.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only array of shape (number of indexes in the group, size of x), of the given dtype (float32 by
+        default); rows follow group_indexes.
+    """
+    if method not in _MATERIALIZE_METHODS:
+        raise ValueError(f"Unsupported method {method!r}, expected one of {_MATERIALIZE_METHODS}")
+    x = np.asarray(x, dtype=float)
+    if x.ndim != 1:
+        raise ValueError(f"The grid must be a 1-D array, got {x.ndim} dimensions")
+    key = (method, np.dtype(dtype))
+    cache = _DistIndex._materialized.setdefault(group, {})
+    if key in cache and np.array_equal(cache[key][0], x):
+        return cache[key][1]
+    indexes = _DistIndex._groups.get(group, [])
+    result = np.empty((len(indexes), x.size), dtype=key[1])
+    for array in _DistIndex._arrays.get(group, {}).values():
+        with np.errstate(divide="ignore", invalid="ignore"):  # Degenerate parameters, replaced below
+            result[array.rows] = array.evaluate(method, x)
+    for i, index in enumerate(indexes):
+        if isinstance(index.value, _PointMass):
+            result[i] = getattr(index.value, method)(x)
+    result.flags.writeable = False
+    cache[key] = (x.copy(), result)
+    return result
@@ -1,9 +1,9 @@
 import math
 import random
-from scipy import stats
 import numpy as np
 
-from dt_model import UniformCategoricalContextVariable, CategoricalContextVariable, PresenceVariable, Index, Constraint, Ensemble, Model
+from dt_model import (UniformCategoricalContextVariable, CategoricalContextVariable, PresenceVariable, Index,
+                      UniformDistIndex, LognormDistIndex, TriangDistIndex, Constraint, Ensemble, Model)
 from sympy import Symbol, Eq, Piecewise
 
 import matplotlib.pyplot as plt
@@ -28,10 +28,10 @@ PV_excursionists = PresenceVariable('excursionists', [CV_weekday, CV_weather], e
 
 # Capacity indexes
 
-I_C_parking = Index('parking capacity', stats.uniform(loc=350.0, scale=100.0))
-I_C_beach = Index('beach capacity', stats.uniform(loc=6000.0, scale=1000.0))
-I_C_accommodation = Index('accommodation capacity', stats.lognorm(s=0.125, loc=0.0, scale=5000.0))
-I_C_food = Index('food service capacity', stats.triang(loc=3000.0, scale=1000.0, c=0.5))
+I_C_parking = UniformDistIndex('parking capacity', loc=350.0, scale=100.0)
+I_C_beach = UniformDistIndex('beach capacity', loc=6000.0, scale=1000.0)
+I_C_accommodation = LognormDistIndex('accommodation capacity', loc=0.0, scale=5000.0, s=0.125)
+I_C_food = TriangDistIndex('food service capacity', loc=3000.0, scale=1000.0, c=0.5)
 
 # Usage indexes
 
@@ -64,7 +64,7 @@ I_Xa_excursionists_per_vehicle = Index('excursionists per vehicle allocation fac
 I_Xo_tourists_parking  = Index('tourists in parking rotation factor', 1.02)
 I_Xo_excursionists_parking = Index('excursionists in parking rotation factor', 3.5)
 
-I_Xo_tourists_beach = Index('tourists on beach rotation factor', stats.uniform(loc=1.0, scale=2.0))
+I_Xo_tourists_beach = UniformDistIndex('tourists on beach rotation factor', loc=1.0, scale=2.0)
 I_Xo_excursionists_beach = Index('excursionists on beach rotation factor', 1.02)
 
 I_Xa_tourists_accommodation = Index('tourists per accommodation allocation factor', 1.05)
@@ -113,7 +113,7 @@ M_Base = Model('base model', [CV_weekday, CV_weather], [PV_tourists, PV_excursio
                [C_parking, C_beach, C_accommodation, C_food])
 
 # Larger park capacity model
-I_C_parking_larger = Index('larger parking capacity', stats.uniform(loc=550.0, scale=100.0))
+I_C_parking_larger = UniformDistIndex('larger parking capacity', loc=550.0, scale=100.0)
 
 M_MoreParking = M_Base.variation('larger parking model', change_capacities={I_C_parking: I_C_parking_larger})
 
@@ -0,0 +1,12 @@
+import pytest
+
+from dt_model import group_indexes
+
+
+@pytest.fixture
+def group(request):
+    """Name of a group used only by the current test; its indexes are removed from it afterwards."""
+    name = request.node.name
+    yield name
+    for index in group_indexes(name):
+        index.remove_from_group()
@@ -0,0 +1,159 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from dt_model import LognormDistIndex, TriangDistIndex, UniformDistIndex, group_indexes, materialize_group
+from dt_model.symbols.index import _DistArraySlot, _DistIndex
+
+X = np.linspace(0.0, 10.0, 101)
+
+
+def test_materialize_group_matches_indexes(group):
+    indexes = [UniformDistIndex(f"{group} u", loc=1.0, scale=2.0, group=group),
+               LognormDistIndex(f"{group} l1", loc=0.0, scale=5.0, s=0.2, group=group),
+               TriangDistIndex(f"{group} t", loc=2.0, scale=3.0, c=0.3, group=group),
+               LognormDistIndex(f"{group} l2", loc=1.0, scale=3.0, s=0.4, group=group)]
+    assert group_indexes(group) == indexes
+    for method in ("pdf", "cdf", "sf"):
+        result = materialize_group(group, X, method, dtype=np.float64)
+        assert result.shape == (4, X.size)
+        for (row, index) in zip(result, indexes):
+            np.testing.assert_allclose(row, getattr(index.value, method)(X))
+    np.testing.assert_allclose(materialize_group(group, X, "cdf", dtype=np.float64)[3],
+                               stats.lognorm(s=0.4, loc=1.0, scale=3.0).cdf(X))
+
+
+def test_materialize_group_is_cached_and_read_only(group):
+    UniformDistIndex(f"{group} u", loc=1.0, scale=2.0, group=group)
+    result = materialize_group(group, X)
+    assert materialize_group(group, X) is result
+    assert materialize_group(group, X.copy()) is result
+    assert materialize_group(group, X[:-1]) is not result
+    with pytest.raises(ValueError):
+        result[0, 0] = 1.0
+
+
+def test_materialize_group_invalidated_by_setter(group):
+    index = UniformDistIndex(f"{group} u", loc=1.0, scale=2.0, group=group)
+    result = materialize_group(group, X)
+    index.loc = 1.0
+    assert materialize_group(group, X) is result
+    index.loc = 4.0
+    updated = materialize_group(group, X, dtype=np.float64)
+    np.testing.assert_allclose(updated[0], stats.uniform(loc=4.0, scale=2.0).pdf(X))
+
+
+def test_materialize_group_invalidated_by_add(group):
+    UniformDistIndex(f"{group} u", loc=1.0, scale=2.0, group=group)
+    assert materialize_group(group, X).shape == (1, X.size)
+    LognormDistIndex(f"{group} l", loc=0.0, scale=5.0, s=0.2, group=group)
+    assert materialize_group(group, X).shape == (2, X.size)
+
+
+def test_materialize_unknown_group():
+    assert materialize_group("no such group", X).shape == (0, X.size)
+
+
+def test_materialize_group_needs_1d_grid(group):
+    UniformDistIndex(f"{group} u", loc=1.0, scale=2.0, group=group)
+    with pytest.raises(ValueError):
+        materialize_group(group, 1.0)
+    with pytest.raises(ValueError):
+        materialize_group(group, X.reshape(-1, 1))
+
+
+def test_update_drops_group_cache_once_and_only_on_change(group):
+    index = LognormDistIndex(f"{group} l", loc=0.0, scale=5.0, s=0.2, group=group)
+    result = materialize_group(group, X)
+    index.update(loc=0.0, s=0.2)
+    assert materialize_group(group, X) is result
+    index.update(scale=6.0, s=0.3)
+    np.testing.assert_allclose(materialize_group(group, X, dtype=np.float64)[0],
+                               stats.lognorm(s=0.3, loc=0.0, scale=6.0).pdf(X))
+
+
+def test_materialize_group_with_point_mass(group):
+    UniformDistIndex(f"{group} u", loc=1.0, scale=2.0, group=group)
+    degenerate = UniformDistIndex(f"{group} z", loc=3.0, scale=0.0, group=group)
+    result = materialize_group(group, X, "cdf", dtype=np.float64)
+    np.testing.assert_array_equal(result[1], np.where(X >= 3.0, 1.0, 0.0))
+    np.testing.assert_allclose(result[0], stats.uniform(loc=1.0, scale=2.0).cdf(X))
+    assert np.isneginf(materialize_group(group, X, "logsf")[1, -1])
+    degenerate.scale = 1.0
+    np.testing.assert_allclose(materialize_group(group, X, "cdf", dtype=np.float64)[1],
+                               stats.uniform(loc=3.0, scale=1.0).cdf(X))
+
+
+def test_materialize_group_unsupported_method(group):
+    UniformDistIndex(f"{group} u", loc=1.0, scale=2.0, group=group)
+    with pytest.raises(ValueError):
+        materialize_group(group, X, "entropy")
+
+
+def test_grouped_parameters_are_views_on_arrays(group):
+    (a, b) = (UniformDistIndex(f"{group} a", loc=1.0, scale=2.0, group=group),
+              UniformDistIndex(f"{group} b", loc=3.0, scale=4.0, group=group))
+    assert isinstance(a.value.kwargs, _DistArraySlot)
+    array = _DistIndex._arrays[group][stats.uniform]
+    np.testing.assert_array_equal(array.params["loc"], [1.0, 3.0])
+    b.loc = 5.0
+    np.testing.assert_array_equal(array.params["loc"], [1.0, 5.0])
+    assert (a.loc, b.loc) == (1.0, 5.0)
+    assert isinstance(b.loc, float)
+
+
+def test_recreated_index_keeps_its_slot(group):
+    index = UniformDistIndex(f"{group} a", loc=0.0, scale=1.0, group=group)
+    assert UniformDistIndex(f"{group} a", loc=5.0, scale=1.0, group=group) is index
+    assert group_indexes(group) == [index]
+    assert index.loc == 5.0
+    index.loc = 10.0
+    result = materialize_group(group, [0.5, 10.5], "cdf", dtype=np.float64)
+    np.testing.assert_array_equal(result, [[0.0, 0.5]])
+
+
+def test_recreated_index_in_another_group(group):
+    index = UniformDistIndex(f"{group} a", loc=0.0, scale=1.0, group=group)
+    other = f"{group} other"
+    try:
+        UniformDistIndex(f"{group} a", loc=2.0, scale=1.0, group=other)
+        assert group_indexes(group) == []
+        assert group_indexes(other) == [index]
+        assert index.group == other
+    finally:
+        index.remove_from_group()
+
+
+def test_remove_from_group(group):
+    indexes = [UniformDistIndex(f"{group} u1", loc=1.0, scale=2.0, group=group),
+               LognormDistIndex(f"{group} l", loc=0.0, scale=5.0, s=0.2, group=group),
+               UniformDistIndex(f"{group} u2", loc=2.0, scale=2.0, group=group),
+               UniformDistIndex(f"{group} z", loc=3.0, scale=0.0, group=group)]
+    materialize_group(group, X)
+    removed = indexes.pop(0)
+    removed.remove_from_group()
+    assert removed.group is None
+    assert (removed.loc, removed.scale) == (1.0, 2.0)
+    removed.loc = 0.0
+    np.testing.assert_allclose(removed.value.cdf(X), stats.uniform(loc=0.0, scale=2.0).cdf(X))
+    assert group_indexes(group) == indexes
+    indexes[1].loc = 4.0
+    result = materialize_group(group, X, "cdf", dtype=np.float64)
+    for (row, index) in zip(result, indexes):
+        np.testing.assert_allclose(row, index.value.cdf(X))
+    for index in indexes:
+        index.remove_from_group()
+    assert group not in _DistIndex._groups
+    assert group not in _DistIndex._arrays
+    removed.remove_from_group()
+
+
+def test_materialize_group_dtype(group):
+    LognormDistIndex(f"{group} l", loc=0.0, scale=5.0, s=0.2, group=group)
+    result = materialize_group(group, X)
+    full = materialize_group(group, X, dtype=np.float64)
+    assert result.dtype == np.float32
+    assert full.dtype == np.float64
+    assert materialize_group(group, X) is result
+    assert materialize_group(group, X, dtype=np.float64) is full
+    np.testing.assert_allclose(result, full, rtol=1e-6, atol=1e-7)
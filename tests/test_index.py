@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from dt_model import LognormDistIndex, TriangDistIndex, UniformDistIndex
+from dt_model.symbols.index import _CACHED_INPUT_SIZE, _cached_evaluate, _PointMass
+
+X = np.linspace(-1.0, 12.0, 131)
+
+
+@pytest.mark.parametrize("index, frozen", [
+    (UniformDistIndex("uniform", loc=1.0, scale=2.0), stats.uniform(loc=1.0, scale=2.0)),
+    (LognormDistIndex("lognorm", loc=0.5, scale=5.0, s=0.25), stats.lognorm(s=0.25, loc=0.5, scale=5.0)),
+    (TriangDistIndex("triang", loc=2.0, scale=3.0, c=0.3), stats.triang(c=0.3, loc=2.0, scale=3.0)),
+])
+def test_dist_index_matches_frozen(index, frozen):
+    for method in ("pdf", "logpdf", "cdf", "logcdf", "sf", "ppf", "isf"):
+        points = np.linspace(0.01, 0.99, 11) if method in ("ppf", "isf") else X
+        with np.errstate(divide="ignore"):
+            np.testing.assert_allclose(getattr(index.value, method)(points), getattr(frozen, method)(points))
+    for method in ("mean", "median", "std", "var", "support"):
+        np.testing.assert_allclose(getattr(index.value, method)(), getattr(frozen, method)())
+    np.testing.assert_allclose(index.value.interval(0.9), frozen.interval(0.9))
+    np.testing.assert_allclose(index.value.rvs(size=5, random_state=3), frozen.rvs(size=5, random_state=3))
+
+
+def test_dist_index_setters_change_parameters_in_place():
+    index = LognormDistIndex("lognorm setters", loc=0.0, scale=5.0, s=0.125)
+    value = index.value
+    index.loc = 1.0
+    index.scale = 4.0
+    index.s = 0.5
+    assert (index.loc, index.scale, index.s) == (1.0, 4.0, 0.5)
+    assert index.value is value
+    np.testing.assert_allclose(index.value.cdf(X), stats.lognorm(s=0.5, loc=1.0, scale=4.0).cdf(X))
+
+
+def test_triang_dist_index_c_setter():
+    index = TriangDistIndex("triang setter", loc=0.0, scale=1.0, c=0.5)
+    index.c = 0.2
+    assert index.c == 0.2
+    np.testing.assert_allclose(index.value.cdf(X), stats.triang(c=0.2).cdf(X))
+
+
+EDGES = np.array([np.nan, -np.inf, np.inf, 1.0, 2.0, 3.0, 0.999999, 3.000001])
+
+
+@pytest.mark.parametrize("loc, scale", [(1.0, 2.0), (0.0, 4.0), (-3.0, 0.5)])
+def test_uniform_closed_form_matches_scipy(loc, scale):
+    index = UniformDistIndex("uniform closed form", loc=loc, scale=scale)
+    frozen = stats.uniform(loc=loc, scale=scale)
+    points = np.concatenate([X, EDGES, [loc, loc + scale]])
+    for method in ("pdf", "cdf", "sf"):
+        np.testing.assert_allclose(getattr(index.value, method)(points), getattr(frozen, method)(points))
+        assert np.ndim(getattr(index.value, method)(loc + scale / 2)) == 0
+
+
+@pytest.mark.parametrize("c", [0.0, 0.3, 0.5, 1.0])
+def test_triang_closed_form_matches_scipy(c):
+    index = TriangDistIndex("triang closed form", loc=1.0, scale=2.0, c=c)
+    frozen = stats.triang(c=c, loc=1.0, scale=2.0)
+    points = np.concatenate([X, EDGES, [1.0 + 2.0 * c]])
+    for method in ("pdf", "cdf", "sf"):
+        np.testing.assert_allclose(getattr(index.value, method)(points), getattr(frozen, method)(points))
+        assert np.ndim(getattr(index.value, method)(2.0)) == 0
+
+
+def test_closed_form_invalid_parameters_fall_back_to_scipy():
+    index = TriangDistIndex("triang invalid", loc=0.0, scale=1.0, c=1.5)
+    assert np.isnan(index.value.cdf(0.5))
+
+
+def test_update_changes_several_parameters():
+    index = LognormDistIndex("lognorm update", loc=0.0, scale=5.0, s=0.125)
+    index.update(scale=6.0, s=0.3)
+    assert (index.loc, index.scale, index.s) == (0.0, 6.0, 0.3)
+    np.testing.assert_allclose(index.value.cdf(X), stats.lognorm(s=0.3, loc=0.0, scale=6.0).cdf(X))
+
+
+def test_update_unknown_parameter():
+    index = UniformDistIndex("uniform update unknown", loc=0.0, scale=1.0)
+    with pytest.raises(TypeError):
+        index.update(loc=2.0, c=0.5)
+    assert index.loc == 0.0
+
+
+@pytest.mark.parametrize("index, point", [
+    (UniformDistIndex("uniform degenerate", loc=3.0, scale=0.0), 3.0),
+    (TriangDistIndex("triang degenerate", loc=2.0, scale=0.0, c=0.5), 2.0),
+    (LognormDistIndex("lognorm degenerate scale", loc=1.0, scale=0.0, s=0.3), 1.0),
+    (LognormDistIndex("lognorm degenerate s", loc=1.0, scale=5.0, s=0.0), 6.0),
+])
+def test_degenerate_parameters_give_point_mass(index, point):
+    assert isinstance(index.value, _PointMass)
+    points = np.array([point - 1.0, point, point + 1.0])
+    np.testing.assert_array_equal(index.value.cdf(points), [0.0, 1.0, 1.0])
+    np.testing.assert_array_equal(index.value.sf(points), [1.0, 0.0, 0.0])
+    np.testing.assert_array_equal(index.value.logsf(points), [0.0, -np.inf, -np.inf])
+    np.testing.assert_array_equal(index.value.pdf(points), [0.0, np.inf, 0.0])
+    np.testing.assert_array_equal(index.value.rvs(size=3), [point] * 3)
+    np.testing.assert_array_equal(index.value.ppf([0.1, 0.9]), [point] * 2)
+    assert (index.value.mean(), index.value.std()) == (point, 0.0)
+
+
+def test_point_mass_switches_in_and_out_through_update():
+    index = UniformDistIndex("uniform switch", loc=1.0, scale=2.0)
+    index.update(scale=0.0)
+    assert isinstance(index.value, _PointMass)
+    assert (index.loc, index.scale) == (1.0, 0.0)
+    index.loc = 4.0
+    assert index.value.cdf(3.9) == 0.0
+    assert index.value.cdf(4.0) == 1.0
+    index.scale = 2.0
+    assert not isinstance(index.value, _PointMass)
+    np.testing.assert_allclose(index.value.cdf(X), stats.uniform(loc=4.0, scale=2.0).cdf(X))
+
+
+def test_small_inputs_are_cached_and_copied():
+    index = LognormDistIndex("lognorm cached", loc=0.0, scale=5.0, s=0.2)
+    points = np.linspace(1.0, 9.0, 20)
+    first = index.value.cdf(points)
+    hits = _cached_evaluate.cache_info().hits
+    second = index.value.cdf(points)
+    assert _cached_evaluate.cache_info().hits == hits + 1
+    assert second is not first
+    assert second.flags.writeable
+    second[0] = 5.0
+    np.testing.assert_allclose(index.value.cdf(points), stats.lognorm(s=0.2, scale=5.0).cdf(points))
+
+
+def test_cached_results_are_read_only():
+    result = _cached_evaluate(stats.lognorm, "cdf", (("loc", 0.0), ("s", 0.2), ("scale", 5.0)),
+                              np.dtype(float).str, (2,), np.array([1.0, 2.0]).tobytes())
+    with pytest.raises(ValueError):
+        result[0] = 1.0
+
+
+def test_cache_follows_parameter_changes():
+    index = LognormDistIndex("lognorm cached setter", loc=0.0, scale=5.0, s=0.2)
+    points = np.linspace(1.0, 9.0, 20)
+    index.value.cdf(points)
+    index.s = 0.4
+    np.testing.assert_allclose(index.value.cdf(points), stats.lognorm(s=0.4, scale=5.0).cdf(points))
+
+
+def test_large_inputs_are_not_cached():
+    index = LognormDistIndex("lognorm not cached", loc=0.0, scale=5.0, s=0.2)
+    points = np.linspace(1.0, 9.0, _CACHED_INPUT_SIZE + 1)
+    misses = _cached_evaluate.cache_info().misses
+    np.testing.assert_allclose(index.value.cdf(points), stats.lognorm(s=0.2, scale=5.0).cdf(points))
+    assert _cached_evaluate.cache_info().misses == misses
@@ -0,0 +1,48 @@
+import numpy as np
+from sympy import Dummy, Piecewise, Symbol
+
+from dt_model import CategoricalContextVariable, Index
+from dt_model.symbols._lambdify import _LambdifyKey, cached_lambdify
+
+
+def test_key_ignores_dummy_indices():
+    (a, b) = (Dummy("a"), Dummy("a"))
+    assert a != b
+    assert _LambdifyKey([a], 2 * a + 1, "numpy", True) == _LambdifyKey([b], 2 * b + 1, "numpy", True)
+    assert hash(_LambdifyKey([a], 2 * a + 1, "numpy", True)) == hash(_LambdifyKey([b], 2 * b + 1, "numpy", True))
+
+
+def test_key_keeps_dummy_positions():
+    (a, b) = (Dummy("a"), Dummy("b"))
+    assert _LambdifyKey([a, b], a - b, "numpy", True) != _LambdifyKey([a, b], b - a, "numpy", True)
+    (c, d) = (Dummy("a"), Dummy("b"))
+    assert _LambdifyKey([a, b], a - b, "numpy", True) == _LambdifyKey([c, d], c - d, "numpy", True)
+
+
+def test_key_distinguishes_symbols_and_dummies():
+    x = Symbol("x")
+    d = Dummy("x")
+    assert _LambdifyKey([x], x + 1, "numpy", True) != _LambdifyKey([d], d + 1, "numpy", True)
+
+
+def test_cached_lambdify_reuses_function():
+    (a, b) = (Dummy("k"), Dummy("k"))
+    f = cached_lambdify([a], a ** 2 + 3)
+    assert cached_lambdify([b], b ** 2 + 3) is f
+    assert f(2) == 7
+
+
+def test_index_uses_cache():
+    cv = CategoricalContextVariable("lambdify weather", {Symbol("sun"): 0.5, Symbol("rain"): 0.5})
+    expr = Piecewise((1.0, cv > 0), (2.0, True))
+    assert Index("first", expr, cvs=[cv]).value is Index("second", expr, cvs=[cv]).value
+    np.testing.assert_array_equal(Index("third", expr, cvs=[cv]).value(np.array([1.0, -1.0])), [1.0, 2.0])
+
+
+def test_cse_is_part_of_key_and_keeps_results():
+    (x, y) = (Symbol("x"), Symbol("y"))
+    expr = (x + y) ** 2 + (x + y) ** 3
+    (f, g) = (cached_lambdify([x, y], expr), cached_lambdify([x, y], expr, cse=False))
+    assert f is not g
+    args = (np.linspace(0.0, 1.0, 5), np.linspace(1.0, 2.0, 5))
+    np.testing.assert_allclose(f(*args), g(*args))
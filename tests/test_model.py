@@ -0,0 +1,34 @@
+import numpy as np
+from scipy import stats
+from sympy import Eq, Piecewise, Symbol
+
+from dt_model import (CategoricalContextVariable, Constraint, Index, LognormDistIndex, Model, PresenceVariable,
+                      UniformDistIndex)
+
+
+def test_evaluate_matches_one_minus_cdf():
+    weather = CategoricalContextVariable("model test weather", {Symbol("good"): 0.7, Symbol("bad"): 0.3})
+    tourists = PresenceVariable("model test tourists", [weather])
+    excursionists = PresenceVariable("model test excursionists", [weather])
+    beach_factor = Index("model test beach factor", Piecewise((0.25, Eq(weather, Symbol("bad"))), (0.5, True)),
+                         cvs=[weather])
+    parking_factor = Index("model test parking factor", 0.4)
+    beach = UniformDistIndex("model test beach capacity", loc=600.0, scale=200.0)
+    parking = LognormDistIndex("model test parking capacity", loc=0.0, scale=300.0, s=0.2)
+    model = Model("model test", [weather], [tourists, excursionists], [beach_factor, parking_factor],
+                  [beach, parking],
+                  [Constraint(usage=(tourists + excursionists) * beach_factor, capacity=beach),
+                   Constraint(usage=excursionists * parking_factor, capacity=parking)])
+    (tt, ee) = (np.linspace(0.0, 2000.0, 21), np.linspace(0.0, 1500.0, 21))
+    ensemble = [(0.7, {weather: Symbol("good")}), (0.3, {weather: Symbol("bad")})]
+
+    field = model.evaluate({tourists: tt, excursionists: ee}, ensemble)
+
+    # evaluate lays out the second presence variable along the first axis
+    (t, e) = (tt[None, :], ee[:, None])
+    beach_expected = sum(w * (1.0 - stats.uniform(loc=600.0, scale=200.0).cdf((t + e) * f))
+                         for (w, f) in [(0.7, 0.5), (0.3, 0.25)])
+    parking_expected = np.broadcast_to(1.0 - stats.lognorm(s=0.2, loc=0.0, scale=300.0).cdf(e * 0.4), field.shape)
+    np.testing.assert_allclose(model.field_elements[model.constraints[0]], beach_expected, atol=1e-12)
+    np.testing.assert_allclose(model.field_elements[model.constraints[1]], parking_expected, atol=1e-12)
+    np.testing.assert_allclose(field, beach_expected * parking_expected, atol=1e-12)